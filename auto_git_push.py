@@ -1,41 +1,136 @@
 import os
+import queue
 import subprocess
+import threading
 import time
 
+try:
+    from watchdog.events import PatternMatchingEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+
 # === Configuration ===
-CHECK_INTERVAL = 10  # seconds between checks
+CHECK_INTERVAL = 10  # seconds between checks (polling fallback)
+MAX_CHECK_INTERVAL = 120  # idle checks back off up to this many seconds
+DEBOUNCE_SECONDS = 2  # quiet period after the last file event before committing
+IGNORE_PATTERNS = ["*.pyc", "*.tmp", "*.lock", "leaderboard_automation.log"]
+IGNORE_DIRS = {".git", "__pycache__"}
 COMMIT_MESSAGE = "Leaderboard Update"
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Every git call targets the repo explicitly; optional locks off so status never races index.lock
+GIT = ["git", "-C", REPO_ROOT]
+GIT_ENV = {"GIT_OPTIONAL_LOCKS": "0", **os.environ}
 
-def run_command(cmd):
-    """Run a shell command and return output."""
-    result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-    return result.stdout.strip(), result.stderr.strip()
+def run_git(*args):
+    """Run a git command in REPO_ROOT (argv list, no shell) and return returncode, stdout, stderr."""
+    result = subprocess.run(
+        GIT + list(args),
+        capture_output=True,
+        text=True,
+        check=False,
+        stdin=subprocess.DEVNULL,
+        env=GIT_ENV,
+    )
+    return result.returncode, result.stdout.strip(), result.stderr.strip()
 
 def check_for_changes():
     """Check if there are any uncommitted changes."""
-    stdout, _ = run_command("git status --porcelain")
+    _, stdout, _ = run_git("status", "--porcelain=v2", "-z")
     return bool(stdout)  # True if there are changes
 
 def auto_commit_push():
-    """Commit and push all changes if any."""
+    """Commit and push all changes if any. Returns True if changes were found."""
     print("🔍 Checking for changes...")
-    if check_for_changes():
-        print("🟡 Changes detected! Committing and pushing...")
-        run_command("git add .")
-        run_command(f'git commit -m "{COMMIT_MESSAGE}"')
-        stdout, stderr = run_command("git push")
-        print(stdout or stderr)
-        print("✅ Changes pushed successfully.\n")
-    else:
+    if not check_for_changes():
         print("✅ No changes detected.\n")
+        return False
+
+    print("🟡 Changes detected! Committing and pushing...")
+    # add -> commit -> push, stopping at the first failing step like `&&`
+    for step, args in (
+        ("add", ["add", "-A"]),
+        ("commit", ["-c", "commit.gpgsign=false", "commit", "-m", COMMIT_MESSAGE]),
+        ("push", ["push"]),
+    ):
+        returncode, stdout, stderr = run_git(*args)
+        if returncode != 0:
+            print(stderr or stdout)
+            print(f"❌ git {step} failed, will retry on the next check.\n")
+            return True
+
+    print(stdout or stderr)
+    print("✅ Changes pushed successfully.\n")
+    return True
+
+def poll_and_push():
+    """Fallback loop: poll git status, backing off while the tree stays clean."""
+    print(f"Will check for changes every {CHECK_INTERVAL} seconds (up to {MAX_CHECK_INTERVAL}s when idle)...\n")
+
+    interval = CHECK_INTERVAL
+    while True:
+        if auto_commit_push():
+            interval = CHECK_INTERVAL
+        else:
+            # Debounce idle periods: back off while nothing changes
+            interval = min(interval * 2, MAX_CHECK_INTERVAL)
+        time.sleep(interval)
+
+def watch_and_push():
+    """Commit only on real filesystem events, once they have been quiet for DEBOUNCE_SECONDS."""
+    print(f"Watching for file changes (debounce {DEBOUNCE_SECONDS}s)...\n")
+
+    events = queue.Queue()
+    handler = PatternMatchingEventHandler(ignore_patterns=IGNORE_PATTERNS, ignore_directories=True)
+
+    def on_any_event(event):
+        # Reads don't change anything worth committing, and our own git calls write under .git
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        if IGNORE_DIRS.intersection(os.path.normpath(event.src_path).split(os.sep)):
+            return
+        events.put(event)
+
+    handler.on_any_event = on_any_event
+
+    def consume():
+        while True:
+            events.get()  # block until something changes
+            while True:
+                try:
+                    events.get(timeout=DEBOUNCE_SECONDS)
+                except queue.Empty:
+                    break
+            # A failed check must not kill this thread, or the watcher would keep running without committing
+            try:
+                auto_commit_push()
+            except Exception as e:
+                print(f"❌ Check failed ({e!r}), will retry on the next change.\n")
+
+    observer = Observer()
+    observer.schedule(handler, REPO_ROOT, recursive=True)
+    observer.start()
+
+    # Pick up anything that changed while the script wasn't running
+    auto_commit_push()
+    threading.Thread(target=consume, daemon=True).start()
+
+    try:
+        while observer.is_alive():
+            observer.join(1)
+    finally:
+        observer.stop()
+        observer.join()
 
 if __name__ == "__main__":
     print("🚀 Auto Git Push Script Started")
-    print(f"Will check for changes every {CHECK_INTERVAL} seconds...\n")
 
     try:
-        while True:
-            auto_commit_push()
-            time.sleep(CHECK_INTERVAL)
+        if Observer is not None:
+            watch_and_push()
+        else:
+            print("'watchdog' not installed, falling back to polling (pip install watchdog)")
+            poll_and_push()
     except KeyboardInterrupt:
         print("\n🛑 Script stopped by user.")
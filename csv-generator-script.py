@@ -1,40 +1,11 @@
+import asyncio
 import csv
 import json
-import time
-from datetime import datetime
+import logging
 
-import requests
+from leaderboard_core import CSV_FIELDS, LeaderboardFetcher, write_leaderboard
 
 
-def fetch_leaderboard_with_headers(contest_slug, offset=0, limit=100):
-    """
-    Fetch leaderboard data from HackerRank with proper headers
-    """
-    url = f"https://www.hackerrank.com/rest/contests/{contest_slug}/leaderboard"
-    
-    # Add headers to mimic browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        'Accept': 'application/json',
-        'Accept-Language': 'en-US,en;q=0.9',
-        'Referer': f'https://www.hackerrank.com/contests/{contest_slug}/leaderboard',
-        'Origin': 'https://www.hackerrank.com',
-    }
-    
-    params = {
-        'offset': offset,
-        'limit': limit
-    }
-    
-    try:
-        print(f"Attempting to fetch data (offset: {offset})...")
-        response = requests.get(url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching data: {e}")
-        return None
-
 def manual_json_input():
     """
     Allow user to manually paste JSON data
@@ -87,36 +58,15 @@ def generate_csv_from_data(data, output_file='leaderboard.csv'):
     
     print(f"\nWriting {len(participants)} participants to {output_file}")
     
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['rank', 'hacker', 'score', 'time_taken', 'country', 'school', 'avatar']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        
-        for participant in participants:
-            writer.writerow({
-                'rank': participant.get('rank', ''),
-                'hacker': participant.get('hacker', ''),
-                'score': participant.get('score', 0),
-                'time_taken': participant.get('time_taken', 0),
-                'country': participant.get('country', ''),
-                'school': participant.get('school', ''),
-                'avatar': participant.get('avatar', '')
-            })
+    async def pages():
+        yield participants
+    
+    # Same writer as the automated fetcher: atomic CSV + metadata, under the leaderboard lock
+    if not asyncio.run(write_leaderboard(pages(), output_file)):
+        return False
     
     print(f"✓ CSV file generated successfully: {output_file}")
     print(f"✓ Total participants: {len(participants)}")
-    
-    # Generate metadata
-    metadata = {
-        'total_participants': len(participants),
-        'generated_at': datetime.now().isoformat(),
-        'top_score': participants[0].get('score', 0) if participants else 0
-    }
-    
-    with open('leaderboard_metadata.json', 'w') as f:
-        json.dump(metadata, f, indent=2)
-    
     print(f"✓ Metadata file generated: leaderboard_metadata.json")
     return True
 
@@ -126,23 +76,16 @@ def generate_sample_csv():
     """
     print("\nGenerating sample CSV file for testing...")
     
-    sample_data = []
-    for i in range(1, 51):
-        sample_data.append({
-            'rank': i,
-            'hacker': f'participant_{i}',
-            'score': max(0, 100 - (i * 2)),
-            'time_taken': 3600 + (i * 60),
-            'country': ['Sri Lanka', 'India', 'USA', 'UK', 'Australia'][i % 5],
-            'school': 'SLIIT',
-            'avatar': ''
-        })
+    countries = ['Sri Lanka', 'India', 'USA', 'UK', 'Australia']
+    sample_rows = [
+        (i, f'participant_{i}', max(0, 100 - (i * 2)), 3600 + (i * 60), countries[i % 5], 'SLIIT', '')
+        for i in range(1, 51)
+    ]
     
     with open('sample_leaderboard.csv', 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['rank', 'hacker', 'score', 'time_taken', 'country', 'school', 'avatar']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(sample_data)
+        writer = csv.writer(csvfile)
+        writer.writerow(CSV_FIELDS)
+        writer.writerows(sample_rows)
     
     print("✓ Sample CSV generated: sample_leaderboard.csv")
     print("✓ You can use this file to test the leaderboard webpage")
@@ -156,45 +99,28 @@ if __name__ == "__main__":
     print("=" * 60)
     print()
     
+    # Progress from the shared fetcher is reported through logging
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    
     # Try automatic fetch first
     print("Attempting automatic data fetch...")
-    all_participants = []
-    offset = 0
-    limit = 100
+    fetcher = LeaderboardFetcher(CONTEST_SLUG, OUTPUT_FILE)
     
-    # Try to fetch first page
-    data = fetch_leaderboard_with_headers(CONTEST_SLUG, offset, limit)
+    async def fetch_and_write():
+        try:
+            return await fetcher.write_csv(fetcher.stream_pages())
+        finally:
+            await fetcher.close()
     
-    if data and 'models' in data:
+    if asyncio.run(fetch_and_write()):
         print("✓ Automatic fetch successful!")
-        
-        # Fetch all pages
-        while True:
-            if not data or 'models' not in data:
-                break
-            
-            participants = data['models']
-            if not participants:
-                break
-            
-            all_participants.extend(participants)
-            print(f"Fetched {len(participants)} participants (Total: {len(all_participants)})")
-            
-            if len(participants) < limit:
-                break
-            
-            offset += limit
-            time.sleep(1)  # Be nice to the server
-            data = fetch_leaderboard_with_headers(CONTEST_SLUG, offset, limit)
-        
-        if all_participants:
-            generate_csv_from_data({'models': all_participants}, OUTPUT_FILE)
     else:
-        print("✗ Automatic fetch failed (403 Forbidden)")
+        print("✗ Automatic fetch failed")
         print("\nThis usually means:")
-        print("- The API requires authentication")
+        print("- The API requires authentication (403 Forbidden)")
         print("- The contest is private")
         print("- Rate limiting is in effect")
+        print("- The automated fetcher is writing the leaderboard right now")
         
         print("\n" + "="*60)
         print("CHOOSE AN OPTION:")
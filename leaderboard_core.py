@@ -0,0 +1,427 @@
+import asyncio
+import csv
+import hashlib
+import json
+import logging
+import operator
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import aiohttp
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    json_loads = json.loads
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+# 429s are paced by the server's Retry-After, so they get their own, larger budget
+MAX_RATE_LIMITED = 20
+# HackerRank quota: sustained requests per second, burst size, and concurrent requests in flight
+REQUESTS_PER_SECOND = 5
+REQUEST_BURST = 10
+MAX_IN_FLIGHT = 16
+CSV_FIELDS = ('rank', 'hacker', 'score', 'time_taken', 'country', 'school', 'avatar')
+# Default per CSV column; merging a participant over this lets one itemgetter build the row tuple
+ROW_DEFAULTS = {'rank': '', 'hacker': '', 'score': 0, 'time_taken': 0, 'country': '', 'school': '', 'avatar': ''}
+_get_row = operator.itemgetter(*CSV_FIELDS)
+METADATA_FILE = 'leaderboard_metadata.json'
+DEFAULT_OUTPUT_FILE = 'leaderboard.csv'
+
+
+def _rate_limit_delay(status, headers):
+    """Seconds to wait before the next request, read from HackerRank's rate-limit headers"""
+    if status == 429:
+        retry_after = headers.get('Retry-After', '')
+        return float(retry_after) if retry_after.isdigit() else 5.0
+    
+    remaining = headers.get('X-RateLimit-Remaining', '')
+    reset = headers.get('X-RateLimit-Reset', '')
+    if remaining == '0' and reset.isdigit():
+        reset = int(reset)
+        # Reset may be an epoch timestamp or a number of seconds from now
+        return max(0.0, reset - time.time()) if reset > 10**9 else float(reset)
+    
+    return 0.0
+
+
+def _backoff_delay(attempt):
+    """Exponential backoff with jitter for transport errors"""
+    return min(60, 2 ** attempt) + random.uniform(0, 1)
+
+
+def _load_previous_hash():
+    """Content hash recorded by the last successful write, if any"""
+    try:
+        with open(METADATA_FILE, encoding='utf-8') as f:
+            return json.load(f).get('content_hash')
+    except (OSError, ValueError):
+        return None
+
+
+class LeakyBucket:
+    """Async token bucket: refills `rate` tokens per second up to `burst`; each request takes one"""
+    
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_refill = time.monotonic()
+        # No token is handed out before this monotonic time; set from the server's rate-limit headers
+        self.not_before = 0.0
+        self._lock = asyncio.Lock()
+    
+    def pause(self, delay):
+        """Hold back every caller, not just the one that saw the rate-limit headers, for `delay` seconds"""
+        self.not_before = max(self.not_before, time.monotonic() + delay)
+    
+    async def acquire(self):
+        # The lock hands out tokens in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.not_before:
+                    await asyncio.sleep(self.not_before - now)
+                    continue
+                self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class IncompleteLeaderboardError(Exception):
+    """Raised by stream_pages when a page could not be fetched, so no partial leaderboard is published"""
+
+
+class _DiscardWrite(Exception):
+    """Raised inside atomic_write to throw away the temp file instead of publishing it"""
+
+
+def _page_rows(page):
+    """CSV row tuples for one page of participants"""
+    return [_get_row({**ROW_DEFAULTS, **p}) for p in page]
+
+
+@contextmanager
+def atomic_write(path, newline=None):
+    """Open a temp file next to `path` for writing and move it into place only once fully written"""
+    tmp = tempfile.NamedTemporaryFile(
+        'w', dir=os.path.dirname(path) or '.', prefix=f'.{os.path.basename(path)}.', suffix='.tmp',
+        delete=False, newline=newline, encoding='utf-8'
+    )
+    try:
+        with tmp:
+            yield tmp
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.chmod(tmp.name, 0o644)
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
+
+
+@contextmanager
+def _try_lock(path):
+    """Non-blocking exclusive inter-process lock on `path`; yields whether it was acquired"""
+    with open(path, 'a+b') as f:
+        try:
+            if sys.platform == 'win32':
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        
+        try:
+            yield True
+        finally:
+            if sys.platform == 'win32':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+async def write_leaderboard(pages, output_file=DEFAULT_OUTPUT_FILE):
+    """
+    Stream an async iterable of participant pages into `output_file` and the metadata file,
+    skipping the write if nothing changed. Only one process writes the leaderboard at a time.
+    """
+    with _try_lock(output_file + '.lock') as acquired:
+        if not acquired:
+            logger.warning("Another process is writing the leaderboard, skipping this update")
+            return False
+        return await _write_leaderboard(pages, output_file)
+
+
+async def _write_leaderboard(pages, output_file):
+    """Body of write_leaderboard, run while holding the leaderboard lock"""
+    hasher = hashlib.blake2b(digest_size=16)
+    total_participants = 0
+    top_score = 0
+    
+    try:
+        with atomic_write(output_file, newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(CSV_FIELDS)
+            
+            async for page in pages:
+                if not page:
+                    continue
+                if not total_participants:
+                    top_score = page[0].get('score', 0)
+                
+                hasher.update(json.dumps(page, sort_keys=True, separators=(',', ':')).encode())
+                writer.writerows(_page_rows(page))
+                total_participants += len(page)
+            
+            content_hash = hasher.hexdigest()
+            if not total_participants or (content_hash == _load_previous_hash() and Path(output_file).exists()):
+                raise _DiscardWrite()
+    
+    except _DiscardWrite:
+        if not total_participants:
+            logger.error("✗ No participants to write")
+            return False
+        logger.info("✓ Leaderboard unchanged since last update, skipping write")
+        return True
+    
+    except IncompleteLeaderboardError as e:
+        logger.error(f"✗ {e}; keeping the previously published leaderboard")
+        return False
+    
+    except Exception as e:
+        logger.error(f"Error generating CSV: {e}")
+        return False
+    
+    logger.info(f"✓ CSV file generated: {output_file} ({total_participants} participants)")
+    
+    try:
+        # Generate metadata; both timestamps come from one clock read so they always agree.
+        # content_hash covers only the participants, never these timestamps.
+        now = datetime.now().replace(microsecond=0)
+        metadata = {
+            'total_participants': total_participants,
+            'generated_at': now.isoformat(),
+            'top_score': top_score,
+            'last_update': now.strftime('%Y-%m-%d %H:%M:%S'),
+            'content_hash': content_hash
+        }
+        
+        with atomic_write(METADATA_FILE) as f:
+            if orjson:
+                f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2).decode())
+            else:
+                json.dump(metadata, f, indent=2)
+        
+        logger.info(f"✓ Metadata updated")
+        return True
+    
+    except Exception as e:
+        logger.error(f"Error writing metadata: {e}")
+        return False
+
+
+class LeaderboardFetcher:
+    def __init__(self, contest_slug, output_file=DEFAULT_OUTPUT_FILE):
+        self.contest_slug = contest_slug
+        self.output_file = output_file
+        self.base_url = f"https://www.hackerrank.com/rest/contests/{contest_slug}/leaderboard"
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'Accept': 'application/json',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Referer': f'https://www.hackerrank.com/contests/{contest_slug}/leaderboard',
+            'Origin': 'https://www.hackerrank.com',
+        }
+        
+        # The aiohttp session lives as long as the fetcher so scheduled updates reuse its connections
+        self._session = None
+        self._bucket = LeakyBucket(rate=REQUESTS_PER_SECOND, burst=REQUEST_BURST)
+    
+    async def _ensure_session(self):
+        """Create the shared aiohttp session on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=16,
+                    limit_per_host=8,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    enable_cleanup_closed=True
+                ),
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the pooled HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+    
+    def _respect_limits(self, status, headers):
+        """Pause the shared bucket as long as the rate-limit headers ask; returns True if the request must be retried"""
+        delay = _rate_limit_delay(status, headers)
+        if delay:
+            logger.warning(f"Rate limited (HTTP {status}), pausing all requests for {delay:.1f}s")
+            self._bucket.pause(delay)
+        return status == 429
+    
+    async def fetch_page_async(self, session, semaphore, offset=0, limit=100):
+        """Fetch a single page of leaderboard data on a shared aiohttp session"""
+        params = {'offset': offset, 'limit': limit}
+        attempt = rate_limited = 0
+        
+        while True:
+            # Wait for a token before taking a connection slot, so paused requests hold neither
+            await self._bucket.acquire()
+            try:
+                async with semaphore, session.get(self.base_url, params=params) as response:
+                    status, headers = response.status, response.headers
+                    body = await response.read() if status < 400 else None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = repr(e)
+            else:
+                # The body is read and the connection released before any pause takes effect
+                if self._respect_limits(status, headers):
+                    rate_limited += 1
+                    if rate_limited < MAX_RATE_LIMITED:
+                        continue
+                    logger.error(f"Giving up on offset {offset} after {MAX_RATE_LIMITED} rate-limited attempts")
+                    return None
+                if status < 500:
+                    if status >= 400:
+                        logger.error(f"HTTP {status} at offset {offset}")
+                        return None
+                    try:
+                        return json_loads(body)
+                    except ValueError as e:
+                        logger.error(f"Invalid JSON at offset {offset}: {e}")
+                        return None
+                # Server errors are usually transient; retry them like transport errors
+                error = f"HTTP {status}"
+            
+            attempt += 1
+            if attempt == MAX_ATTEMPTS:
+                break
+            delay = _backoff_delay(attempt - 1)
+            logger.warning(f"Error fetching data at offset {offset}: {error}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        
+        logger.error(f"Giving up on offset {offset} after {MAX_ATTEMPTS} attempts: {error}")
+        return None
+    
+    async def stream_pages(self):
+        """Yield each page of participants in rank order as soon as it and all earlier pages arrive"""
+        limit = 100
+        
+        logger.info("Starting data fetch...")
+        
+        session = await self._ensure_session()
+        semaphore = asyncio.Semaphore(MAX_IN_FLIGHT)
+        
+        # The first page doubles as the probe: its envelope carries the leaderboard size
+        first = await self.fetch_page_async(session, semaphore, 0, limit)
+        if not first or 'models' not in first:
+            return
+        
+        # Step by what the server actually served, in case it caps the page below `limit`
+        page_size = fetched = len(first['models'])
+        logger.info(f"Fetched {fetched} participants (Total: {fetched})")
+        yield first['models']
+        
+        total = first.get('total')
+        if not page_size:
+            return
+        
+        if total is None:
+            # No size in the envelope: page sequentially until a short or empty page
+            offset = page_size
+            while True:
+                data = await self.fetch_page_async(session, semaphore, offset, limit)
+                if not data or 'models' not in data:
+                    raise IncompleteLeaderboardError(f"Missing page at offset {offset}")
+                if not data['models']:
+                    return
+                
+                fetched += len(data['models'])
+                logger.info(f"Fetched {len(data['models'])} participants (Total: {fetched})")
+                yield data['models']
+                
+                if len(data['models']) < page_size:
+                    return
+                offset += len(data['models'])
+        
+        offsets = range(page_size, total, page_size)
+        
+        async def fetch(offset):
+            return offset, await self.fetch_page_async(session, semaphore, offset, limit)
+        
+        tasks = [asyncio.ensure_future(fetch(offset)) for offset in offsets]
+        try:
+            # Pages complete out of order; buffer them until the next expected offset is ready
+            buffered = {}
+            expected = iter(offsets)
+            next_offset = next(expected, None)
+            
+            for completed in asyncio.as_completed(tasks):
+                offset, data = await completed
+                buffered[offset] = data
+                
+                while next_offset in buffered:
+                    data = buffered.pop(next_offset)
+                    if not data or 'models' not in data:
+                        # Publishing without this page would leave a hole in the rankings
+                        raise IncompleteLeaderboardError(f"Missing page at offset {next_offset}")
+                    
+                    fetched += len(data['models'])
+                    logger.info(f"Fetched {len(data['models'])} participants (Total: {fetched})")
+                    yield data['models']
+                    next_offset = next(expected, None)
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        if fetched < total:
+            # Short pages mid-board would otherwise drop rows without any error
+            raise IncompleteLeaderboardError(f"Fetched {fetched} of {total} participants")
+    
+    async def write_csv(self, pages):
+        """Stream pages of participants into this fetcher's output file"""
+        return await write_leaderboard(pages, self.output_file)
+    
+    async def update_leaderboard(self):
+        """Main update function"""
+        logger.info("="*60)
+        logger.info("Starting leaderboard update")
+        logger.info("="*60)
+        
+        try:
+            if await self.write_csv(self.stream_pages()):
+                logger.info("✓ Leaderboard update complete")
+                return True
+            else:
+                logger.error("✗ Leaderboard update failed")
+                return False
+                
+        except Exception as e:
+            logger.error(f"✗ Update failed with exception: {e}")
+            return False